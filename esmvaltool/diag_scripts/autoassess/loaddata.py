@@ -14,52 +14,62 @@ available here: https://code.metoffice.gov.uk/doc/um/vn10.5/umdp.html.
 import os.path
 import re
 import datetime
-from datetime import timedelta as td
 from datetime import datetime as dd
 
 import cf_units
 import iris
 import iris.coord_categorisation as coord_cat
+import numpy as np
+
+
+def _time_spans_in_days(cube):
+    """
+    Return the widths of the time bounds of a cube in days.
+
+    The widths are converted from the interval unit of the time coordinate,
+    e.g. hours for 'hours since ...', so all checks below work in days.
+    """
+    time = cube.coord('time')
+    time_interval = cf_units.Unit(time.units.origin.split(' since ')[0])
+    return time_interval.convert(time.bounds[:, 1] - time.bounds[:, 0],
+                                 'days')
 
 
 def is_daily(cube):
     """Test whether the time coordinate contains only daily bound periods."""
-    def is_day(bound):
-        """Check if day."""
-        time_span = td(hours=(bound[1] - bound[0]))
-        return td(days=1) == time_span
-
-    return all([is_day(bound) for bound in cube.coord('time').bounds])
+    return bool(np.all(np.isclose(_time_spans_in_days(cube), 1.)))
 
 
 def is_monthly(cube):
     """A month is a period of at least 28 days, up to 31 days."""
-    def is_month(bound):
-        """Check if month."""
-        time_span = td(days=(bound[1] - bound[0]))
-        return td(days=31) >= time_span >= td(days=28)
-
-    return all([is_month(bound) for bound in cube.coord('time').bounds])
+    spans = _time_spans_in_days(cube)
+    return bool(np.all((spans >= 28.) & (spans <= 31.)))
 
 
 def is_seasonal(cube):
     """Season is 3 months, i.e. at least 89 days, and up to 92 days."""
-    def is_season(bound):
-        """Check if season."""
-        time_span = td(days=(bound[1] - bound[0]))
-        return td(days=31 + 30 + 31) >= time_span >= td(days=28 + 31 + 30)
-
-    return all([is_season(bound) for bound in cube.coord('time').bounds])
+    spans = _time_spans_in_days(cube)
+    return bool(
+        np.all((spans >= 28. + 31. + 30.) & (spans <= 31. + 30. + 31.)))
 
 
 def is_yearly(cube):
     """A year is a period of at least 360 days, up to 366 days."""
-    def is_year(bound):
-        """Check if year."""
-        time_span = td(days=(bound[1] - bound[0]))
-        return td(days=365) == time_span or td(days=360) == time_span
+    return bool(np.all(_is_year(_time_spans_in_days(cube))))
+
 
-    return all([is_year(bound) for bound in cube.coord('time').bounds])
+def _is_year(spans):
+    """Check which time spans in days are years of 365 or 360 days."""
+    return np.isclose(spans, 365.) | np.isclose(spans, 360.)
+
+
+def _select_time_indices(cube, indices):
+    """Return the cube at the given time indices, or None if there are none."""
+    if indices.size == 0:
+        return None
+    keys = [slice(None)] * cube.ndim
+    keys[cube.coord_dims('time')[0]] = indices
+    return cube[tuple(keys)]
 
 
 def is_time_mean(cube):
@@ -116,19 +126,21 @@ def seasonal_mean(mycube):
     Chunks time in 3-month periods and computes means over them;
     Returns a cube.
     """
-    if 'clim_season' not in mycube.coords():
+    # Reuse existing season coordinates. New ones are still built by iris,
+    # which converts all time points with one num2date call and keeps the
+    # labels and attributes consistent with the rest of iris.
+    if not mycube.coords('clim_season'):
         coord_cat.add_season(mycube, 'time', name='clim_season')
-    if 'season_year' not in mycube.coords():
+    if not mycube.coords('season_year'):
         coord_cat.add_season_year(mycube, 'time', name='season_year')
     annual_seasonal_mean = mycube.aggregated_by(['clim_season', 'season_year'],
                                                 iris.analysis.MEAN)
 
-    def spans_three_months(time):
-        """Check for three months."""
-        return (time.bound[1] - time.bound[0]) == 90  # days
-
-    three_months_bound = iris.Constraint(time=spans_three_months)
-    return annual_seasonal_mean.extract(three_months_bound)
+    # Keep only the seasons spanning three months (90 days), comparing all
+    # time bounds at once instead of checking each cell in a constraint.
+    spans = _time_spans_in_days(annual_seasonal_mean)
+    three_months = np.flatnonzero(np.isclose(spans, 90.))
+    return _select_time_indices(annual_seasonal_mean, three_months)
 
 
 # get annual mean
@@ -139,15 +151,15 @@ def annual_mean(mycube):
     Chunks time in 365-day periods and computes means over them;
     Returns a cube.
     """
-    coord_cat.add_year(mycube, 'time')
+    if not mycube.coords('year'):
+        coord_cat.add_year(mycube, 'time')
     yr_mean = mycube.aggregated_by('year', iris.analysis.MEAN)
 
-    def spans_year(time):
-        """Check for 12 months."""
-        return (time.bound[1] - time.bound[0]) == 365
-
-    t_bound = iris.Constraint(time=spans_year)
-    return yr_mean.extract(t_bound)
+    # Keep only the complete years, i.e. the same 365 or 360-day spans that
+    # is_yearly accepts.
+    spans = _time_spans_in_days(yr_mean)
+    full_years = np.flatnonzero(_is_year(spans))
+    return _select_time_indices(yr_mean, full_years)
 
 
 def select_by_averaging_period(cubes, averaging_period):
@@ -168,20 +180,19 @@ def select_by_averaging_period(cubes, averaging_period):
         'seasonal': is_seasonal,
         'annual': is_yearly
     }
-    if averaging_period == 'seasonal':
-        selected_cubes = [
-            cube for cube in cubes
-            if select_period[averaging_period](seasonal_mean(cube))
-        ]
-    elif averaging_period == 'annual':
-        selected_cubes = [
-            cube for cube in cubes
-            if select_period[averaging_period](annual_mean(cube))
-        ]
-    else:
-        selected_cubes = [
-            cube for cube in cubes if select_period[averaging_period](cube)
-        ]
+    average = {
+        'seasonal': seasonal_mean,
+        'annual': annual_mean,
+    }
+    selected_cubes = []
+    for cube in cubes:
+        averaged_cube = cube
+        if averaging_period in average:
+            # No complete season or year gives None, which is never selected.
+            averaged_cube = average[averaging_period](cube)
+        if (averaged_cube is not None
+                and select_period[averaging_period](averaged_cube)):
+            selected_cubes.append(cube)
     return iris.cube.CubeList(selected_cubes)
 
 
@@ -63,7 +63,7 @@ from esmvaltool.diag_scripts.shared import ProvenanceLogger
 logger = logging.getLogger(os.path.basename(__file__))
 
 
-def timeplot(cube, **kwargs):
+def timeplot(cube, axes=None, **kwargs):
     """
     Create a time series plot from the cube.
 
@@ -79,15 +79,20 @@ def timeplot(cube, **kwargs):
     ----------
     cube: iris.cube.Cube
         Input cube
+    axes: matplotlib.axes.Axes
+        The axes to draw on. The current pyplot axes are used if not given.
 
     """
-    cubedata = np.ma.array(cube.data)
-    if len(cubedata.compressed()) == 1:
-        plt.axhline(cubedata.compressed(), **kwargs)
+    if axes is None:
+        axes = plt.gca()
+
+    cubedata = cube.data
+    if np.ma.count(cubedata) == 1:
+        axes.axhline(np.ma.compressed(cubedata)[0], **kwargs)
         return
 
     times = diagtools.cube_time_to_float(cube)
-    plt.plot(times, cubedata, **kwargs)
+    axes.plot(times, cubedata, **kwargs)
 
 
 def moving_average(cube, window):
@@ -140,13 +145,13 @@ def moving_average(cube, window):
 
     datetime = diagtools.guess_calendar_datetime(cube)
 
-    output = []
-
     times = np.array([
         datetime(time_itr.year, time_itr.month, time_itr.day, time_itr.hour,
                  time_itr.minute) for time_itr in times
     ])
 
+    tmins = []
+    tmaxs = []
     for time_itr in times:
         if win_units in ['years', 'yrs', 'year', 'yr']:
             tmin = datetime(time_itr.year - window_len, time_itr.month,
@@ -167,10 +172,32 @@ def moving_average(cube, window):
             tmax = datetime(time_itr.year, time_itr.month,
                             time_itr.day + window_len, time_itr.hour,
                             time_itr.minute)
+        tmins.append(tmin)
+        tmaxs.append(tmax)
+
+    # Sort the time points, so that each window is a contiguous run of the
+    # sorted series, and find the edges of all windows at once. Each window
+    # mean is then taken over the unmasked points of its own slice.
+    order = np.argsort(times)
+    sorted_times = times[order]
+    sorted_data = np.ma.array(cube.data)[order]
+
+    lower = np.searchsorted(sorted_times, tmins, side='left')
+    upper = np.searchsorted(sorted_times, tmaxs, side='right')
+
+    output = []
+    for low, high in zip(lower, upper):
+        window_data = sorted_data[low:high].compressed()
+        if window_data.size:
+            output.append(window_data.mean())
+        else:
+            output.append(np.nan)
 
-        arr = np.ma.masked_where((times < tmin) + (times > tmax), cube.data)
-        output.append(arr.mean())
-    cube.data = np.array(output)
+    if np.issubdtype(cube.dtype, np.floating):
+        dtype = cube.dtype
+    else:
+        dtype = np.float64
+    cube.data = np.array(output, dtype=dtype)
     return cube
 
 
@@ -215,10 +242,11 @@ def make_time_series_plots(
         if 'moving_average' in cfg:
             cube_layer = moving_average(cube_layer, cfg['moving_average'])
 
+        fig, axes = plt.subplots()
         if multi_model:
-            timeplot(cube_layer, label=metadata['dataset'], ls=':')
+            timeplot(cube_layer, axes=axes, label=metadata['dataset'], ls=':')
         else:
-            timeplot(cube_layer, label=metadata['dataset'])
+            timeplot(cube_layer, axes=axes, label=metadata['dataset'])
 
         # Add title, legend to plots
         title = ' '.join([metadata['dataset'], metadata['long_name']])
@@ -228,9 +256,9 @@ def make_time_series_plots(
             else:
                 z_units = ''
             title = ' '.join([title, '(', layer, str(z_units), ')'])
-        plt.title(title)
-        plt.legend(loc='best')
-        plt.ylabel(str(cube_layer.units))
+        axes.set_title(title)
+        axes.legend(loc='best')
+        axes.set_ylabel(str(cube_layer.units))
 
         # Determine image filename:
         if multi_model:
@@ -262,8 +290,8 @@ def make_time_series_plots(
 
         # Saving files
         logger.info('Saving plots to %s', path)
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        plt.close(fig)
 
         provenance_record = diagtools.prepare_provenance_record(
             cfg,
@@ -318,6 +346,7 @@ def multi_model_time_series(
     # Make a plot for each layer
     for layer in layers:
 
+        fig, axes = plt.subplots()
         title = ''
         z_units = ''
         plot_details = {}
@@ -340,6 +369,7 @@ def multi_model_time_series(
             if 'MultiModel' in metadata[filename]['dataset']:
                 timeplot(
                     cube,
+                    axes=axes,
                     c=color,
                     # label=metadata[filename]['dataset'],
                     ls=':',
@@ -354,6 +384,7 @@ def multi_model_time_series(
             else:
                 timeplot(
                     cube,
+                    axes=axes,
                     c=color,
                     # label=metadata[filename]['dataset'])
                     ls='-',
@@ -375,9 +406,9 @@ def multi_model_time_series(
         # Add title, legend to plots
         if layer:
             title = ' '.join([title, '(', str(layer), str(z_units), ')'])
-        plt.title(title)
-        plt.legend(loc='best')
-        plt.ylabel(str(model_cubes[filename][layer].units))
+        axes.set_title(title)
+        axes.legend(loc='best')
+        axes.set_ylabel(str(model_cubes[filename][layer].units))
 
         # Saving files:
         path = diagtools.get_image_path(
@@ -393,13 +424,13 @@ def multi_model_time_series(
         )
 
         # Resize and add legend outside thew axes.
-        plt.gcf().set_size_inches(9., 6.)
+        fig.set_size_inches(9., 6.)
         diagtools.add_legend_outside_right(
-            plot_details, plt.gca(), column_width=0.15)
+            plot_details, axes, column_width=0.15)
 
         logger.info('Saving plots to %s', path)
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        plt.close(fig)
 
         provenance_record = diagtools.prepare_provenance_record(
             cfg,
@@ -0,0 +1,104 @@
+"""Tests for :mod:`esmvaltool.diag_scripts.autoassess.loaddata`."""
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+from cf_units import Unit
+
+from esmvaltool.diag_scripts.autoassess import loaddata
+
+
+def get_cube(n_months, units='days since 2000-01-01'):
+    """Return a monthly cube in a 360-day calendar starting in January."""
+    bounds = 30. * np.stack([np.arange(n_months),
+                             np.arange(1, n_months + 1)], axis=-1)
+    if units.startswith('hours'):
+        bounds = 24. * bounds
+    time = iris.coords.DimCoord(
+        bounds.mean(axis=-1),
+        bounds=bounds,
+        standard_name='time',
+        units=Unit(units, calendar='360_day'))
+    return iris.cube.Cube(np.arange(n_months, dtype=float), var_name='tas',
+                          dim_coords_and_dims=[(time, 0)])
+
+
+UNITS = ['days since 2000-01-01', 'hours since 2000-01-01']
+
+
+@pytest.mark.parametrize('units', UNITS)
+def test_seasonal_mean(units):
+    """Check that only complete seasons are kept."""
+    # January 2000 to December 2001: the first DJF only contains January
+    # and February and the last one only December, so both are dropped.
+    cube = get_cube(24, units)
+    result = loaddata.seasonal_mean(cube)
+
+    assert result.coord('clim_season').points.tolist() == [
+        'mam', 'jja', 'son', 'djf', 'mam', 'jja', 'son']
+    assert result.coord('season_year').points.tolist() == [
+        2000, 2000, 2000, 2001, 2001, 2001, 2001]
+    np.testing.assert_allclose(result.data,
+                               [3., 6., 9., 12., 15., 18., 21.])
+    assert loaddata.is_seasonal(result)
+    assert not loaddata.is_monthly(result)
+
+
+def test_seasonal_mean_twice():
+    """Check that the season coordinates of an earlier call are reused."""
+    cube = get_cube(24)
+    first = loaddata.seasonal_mean(cube)
+    second = loaddata.seasonal_mean(cube)
+
+    assert len(cube.coords('clim_season')) == 1
+    assert len(cube.coords('season_year')) == 1
+    assert second == first
+
+
+def test_seasonal_mean_no_complete_season():
+    """Check that None is returned without a complete season."""
+    cube = get_cube(2)
+    assert loaddata.seasonal_mean(cube) is None
+
+
+@pytest.mark.parametrize('units', UNITS)
+def test_annual_mean(units):
+    """Check that only complete 360-day years are kept."""
+    cube = get_cube(30, units)
+    result = loaddata.annual_mean(cube)
+
+    assert result.coord('year').points.tolist() == [2000, 2001]
+    np.testing.assert_allclose(result.data, [5.5, 17.5])
+    assert loaddata.is_yearly(result)
+
+
+def test_annual_mean_no_complete_year():
+    """Check that None is returned without a complete year."""
+    cube = get_cube(6)
+    assert loaddata.annual_mean(cube) is None
+
+
+@pytest.mark.parametrize('units', UNITS)
+def test_is_monthly(units):
+    """Check the monthly test in different time units."""
+    cube = get_cube(3, units)
+    assert loaddata.is_monthly(cube)
+    assert not loaddata.is_daily(cube)
+    assert not loaddata.is_seasonal(cube)
+    assert not loaddata.is_yearly(cube)
+
+
+@pytest.mark.parametrize('period,n_months,selected', [
+    ('monthly', 2, True),
+    ('seasonal', 2, False),
+    ('seasonal', 24, True),
+    ('annual', 6, False),
+    ('annual', 24, True),
+])
+def test_select_by_averaging_period(period, n_months, selected):
+    """Check that cubes without a complete period are not selected."""
+    cube = get_cube(n_months)
+    result = loaddata.select_by_averaging_period([cube], period)
+    assert len(result) == int(selected)
+    if selected:
+        assert result[0] is cube
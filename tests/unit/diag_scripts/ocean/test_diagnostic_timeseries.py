@@ -0,0 +1,114 @@
+"""Tests for :mod:`esmvaltool.diag_scripts.ocean.diagnostic_timeseries`."""
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+from cf_units import Unit
+
+from esmvaltool.diag_scripts.ocean import diagnostic_timeseries
+
+
+def get_cube(data, descending=False, dtype=float):
+    """Return an annual time series cube with the given data."""
+    points = 365. * np.arange(len(data)) + 182.
+    data = np.ma.array(data, dtype=dtype)
+    if descending:
+        points = points[::-1]
+        data = data[::-1]
+    time = iris.coords.DimCoord(
+        points,
+        standard_name='time',
+        units=Unit('days since 2000-01-01', calendar='365_day'))
+    return iris.cube.Cube(data, var_name='tos',
+                          dim_coords_and_dims=[(time, 0)])
+
+
+def masked_mean_reference(cube, half_width):
+    """Average each point over the masked window of +/- half_width years.
+
+    Windows without unmasked points give NaN, as the original
+    implementation did when converting its masked means to an array.
+    """
+    time = cube.coord('time')
+    times = time.units.num2date(time.points)
+    years = np.array([time_itr.year for time_itr in times])
+    output = []
+    for year in years:
+        window = np.ma.masked_where(
+            (years < year - half_width) | (years > year + half_width),
+            cube.data)
+        if window.count():
+            output.append(window.mean())
+        else:
+            output.append(np.nan)
+    return np.array(output, dtype=float)
+
+
+DATA = np.ma.masked_array(
+    [1., 2., 3., 4., 5., 6., 7., 8., 9., 10., 11., 12.],
+    mask=[0, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0],
+)
+LARGE_DATA = np.ma.masked_array(
+    [290., 290., 290., 1e20] + [290.] * 30,
+    mask=False,
+)
+NAN_DATA = np.ma.masked_array(
+    [1., 2., np.nan, 4., 5., 6., 7., 8.],
+    mask=[0, 0, 0, 0, 0, 1, 0, 0],
+)
+
+
+@pytest.mark.parametrize('data,window', [
+    (DATA, '2 years'),
+    (DATA, '4 years'),
+    (LARGE_DATA, '10 years'),
+    (NAN_DATA, '2 years'),
+])
+@pytest.mark.parametrize('descending', [False, True])
+def test_moving_average(data, window, descending):
+    """Compare the moving average with a per-point masked mean."""
+    cube = get_cube(data, descending=descending)
+    half_width = int(window.split()[0]) // 2
+    expected = masked_mean_reference(cube, half_width)
+
+    result = diagnostic_timeseries.moving_average(cube, window)
+
+    assert not np.ma.is_masked(result.data)
+    np.testing.assert_allclose(result.data, expected)
+
+
+def test_moving_average_edges_and_masked_window():
+    """Check partial windows at the edges and a fully masked window."""
+    cube = get_cube(DATA)
+    result = diagnostic_timeseries.moving_average(cube, '2 years')
+
+    # The first window only contains the first two points.
+    assert result.data[0] == 1.
+    # Points 7 to 9 only see masked data, which gives an unmasked NaN.
+    assert np.isnan(result.data[8])
+    assert not np.ma.is_masked(result.data)
+    # The last window only contains the last two points.
+    assert result.data[-1] == 12.
+
+
+def test_moving_average_unmasked_nan():
+    """Check that unmasked NaN propagates to the windows containing it."""
+    cube = get_cube(NAN_DATA)
+    result = diagnostic_timeseries.moving_average(cube, '2 years')
+
+    np.testing.assert_array_equal(
+        np.isnan(result.data),
+        [False, True, True, True, False, False, False, False])
+
+
+@pytest.mark.parametrize('dtype,expected_dtype', [
+    (np.float32, np.float32),
+    (np.float64, np.float64),
+    (np.int32, np.float64),
+])
+def test_moving_average_dtype(dtype, expected_dtype):
+    """Check that floating point data keeps its dtype."""
+    cube = get_cube(np.ma.arange(6), dtype=dtype)
+    result = diagnostic_timeseries.moving_average(cube, '2 years')
+
+    assert result.dtype == expected_dtype